@@ -5,7 +5,6 @@ from typing import Optional
 from fastapi import APIRouter, Query, HTTPException, Depends, Response
 from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
-from io import BytesIO
 
 from app.db.database import get_db
 from app.db.models import User, StudyPlan
@@ -116,19 +115,15 @@ async def export_calendar_ics(
         # Generate ICS file
         service = CalendarService()
         calendar_name = calendar_name or f"Study Plan {study_plan.id}"
-        ics_content = service.generate_ics_file(
+        ics_chunks = service.iter_ics_file(
             study_plan.id, user_id, db, calendar_name
         )
         
-        # Create file-like object
-        ics_bytes = ics_content.encode('utf-8')
-        ics_file = BytesIO(ics_bytes)
-        
-        # Return as downloadable file
+        # Stream as downloadable file (chunks are already UTF-8 encoded)
         filename = f"study_plan_{study_plan.id}.ics"
         
         return StreamingResponse(
-            iter([ics_bytes]),
+            ics_chunks,
             media_type="text/calendar",
             headers={
                 "Content-Disposition": f'attachment; filename="{filename}"',
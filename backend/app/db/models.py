@@ -389,6 +389,11 @@ class CalendarEvent(Base):
     # Relationships
     study_plan = relationship("StudyPlan", back_populates="calendar_events")
     task = relationship("DailyTask", back_populates="calendar_events")
+    
+    # Indexes for performance optimization
+    __table_args__ = (
+        Index("idx_calendar_event_plan_task", "study_plan_id", "task_id"),
+    )
 
 
 
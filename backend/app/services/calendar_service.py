@@ -7,13 +7,22 @@ This service:
 2. Generates ICS (iCalendar) format files
 3. Regenerates calendar on plan updates
 4. Manages calendar event synchronization
+
+Task lookups filter on study_plan_id plus a task_date range and order by task_date,
+which relies on the composite (study_plan_id, task_date) index on daily_tasks
+(idx_task_study_plan_date). Event lookups, deletes and ICS cache-key aggregates
+filter on study_plan_id and rely on idx_calendar_event_plan_task (databases created
+before that index need scripts/migrate_add_calendar_event_index.py).
 """
+import io
 import logging
-from datetime import datetime, timedelta
-from typing import List, Optional, Dict, Any
+import threading
+from collections import OrderedDict
+from datetime import datetime, timedelta, timezone
+from typing import List, Optional, Dict, Any, Tuple, Iterator
 from uuid import uuid4
-from sqlalchemy.orm import Session
-from sqlalchemy import func
+from sqlalchemy.orm import Session, joinedload, load_only
+from sqlalchemy import func, inspect
 
 from app.db.models import (
     StudyPlan, DailyTask, CalendarEvent, TaskStatusEnum
@@ -21,13 +30,102 @@ from app.db.models import (
 
 logger = logging.getLogger(__name__)
 
+# Default event duration (in minutes)
+DEFAULT_EVENT_DURATION = 60  # 1 hour
+
+# Translation table for escaping ICS text values
+_ICS_ESCAPE = str.maketrans({"\\": "\\\\", ",": "\\,", ";": "\\;", "\n": "\\n"})
+
+# Calendar header (with UTC timezone) and footer; {name} is the calendar name
+_ICS_HEADER_TEMPLATE = (
+    "BEGIN:VCALENDAR\r\n"
+    "VERSION:2.0\r\n"
+    "PRODID:-//Interview Readiness Coach//Study Plan//EN\r\n"
+    "X-WR-CALNAME:{name}\r\n"
+    "CALSCALE:GREGORIAN\r\n"
+    "METHOD:PUBLISH\r\n"
+    "BEGIN:VTIMEZONE\r\n"
+    "TZID:UTC\r\n"
+    "BEGIN:STANDARD\r\n"
+    "DTSTART:19700101T000000Z\r\n"
+    "TZOFFSETFROM:+0000\r\n"
+    "TZOFFSETTO:+0000\r\n"
+    "TZNAME:UTC\r\n"
+    "END:STANDARD\r\n"
+    "END:VTIMEZONE\r\n"
+)
+_ICS_FOOTER = "END:VCALENDAR"
+_EMPTY_ICS_TEMPLATE = _ICS_HEADER_TEMPLATE + _ICS_FOOTER
+
+# Fixed leading lines of every VEVENT; optional properties are appended after it
+_VEVENT_TEMPLATE = (
+    "BEGIN:VEVENT\r\n"
+    "UID:{uid}@irc-coach.local\r\n"
+    "DTSTART:{dtstart}\r\n"
+    "DTEND:{dtend}\r\n"
+    "SUMMARY:{summary}\r\n"
+    "DTSTAMP:{dtstamp}\r\n"
+    "CREATED:{created}\r\n"
+)
+
+# CalendarEvent attributes read by _event_to_ics
+_ICS_EVENT_ATTRIBUTES = frozenset({
+    "ics_uid", "start_time", "end_time", "title",
+    "created_at", "description", "location", "task_id"
+})
+
+# In-process LRU cache of generated ICS content.
+# Keys start with the study plan ID and include the plan/event state they were built from.
+_ICS_CACHE_MAX_SIZE = 128
+# Larger documents are streamed without being cached, so chunks aren't retained
+_ICS_CACHE_MAX_ENTRY_BYTES = 256 * 1024
+_ICS_CACHE: "OrderedDict[Tuple[Any, ...], bytes]" = OrderedDict()
+_ICS_CACHE_LOCK = threading.Lock()
+
+
+def _get_cached_ics(key: Tuple[Any, ...]) -> Optional[bytes]:
+    """Return cached ICS content for a key, marking it most recently used."""
+    with _ICS_CACHE_LOCK:
+        content = _ICS_CACHE.get(key)
+        if content is not None:
+            _ICS_CACHE.move_to_end(key)
+        return content
+
+
+def _store_cached_ics(key: Tuple[Any, ...], content: bytes) -> None:
+    """Store ICS content, evicting the least recently used entry when full."""
+    with _ICS_CACHE_LOCK:
+        _ICS_CACHE[key] = content
+        _ICS_CACHE.move_to_end(key)
+        while len(_ICS_CACHE) > _ICS_CACHE_MAX_SIZE:
+            _ICS_CACHE.popitem(last=False)
+
+
+def _invalidate_ics_cache(study_plan_id: int) -> None:
+    """Drop all cached ICS content for a study plan."""
+    with _ICS_CACHE_LOCK:
+        for key in [key for key in _ICS_CACHE if key[0] == study_plan_id]:
+            del _ICS_CACHE[key]
+
+
+def _format_ics_datetime(dt: datetime) -> str:
+    """Format datetime to ICS format (UTC). Naive datetimes are assumed to be UTC."""
+    if dt.tzinfo is not None:
+        dt = dt.astimezone(timezone.utc)
+    return dt.strftime("%Y%m%dT%H%M%SZ")
+
+
+def _escape_ics_text(text: str) -> str:
+    """Escape text for ICS format."""
+    if not text:
+        return ""
+    # Replace special characters in a single pass
+    return text.translate(_ICS_ESCAPE)
+
 
 class CalendarService:
     """Service for generating calendar events and ICS exports."""
     
-    # Default event duration (in minutes)
-    DEFAULT_EVENT_DURATION = 60  # 1 hour
-    
     def generate_calendar_events_from_plan(
         self,
         study_plan_id: int,
@@ -35,7 +133,8 @@ class CalendarService:
         db: Session,
         start_date: Optional[datetime] = None,
         end_date: Optional[datetime] = None,
-        regenerate: bool = False
+        regenerate: bool = False,
+        study_plan: Optional[StudyPlan] = None
     ) -> List[CalendarEvent]:
         """
         Generate calendar events from all tasks in a study plan.
@@ -47,31 +146,81 @@ class CalendarService:
             start_date: Only include tasks after this date (defaults to today)
             end_date: Only include tasks before this date (defaults to plan end)
             regenerate: If True, delete existing events and regenerate
+            study_plan: Already-loaded study plan (skips fetching it again)
         
         Returns:
             List of created CalendarEvent objects
         """
+        tasks, events_by_task = self._write_calendar_events(
+            study_plan_id, user_id, db, start_date, end_date, regenerate, study_plan
+        )
+        
+        if len(events_by_task) < len(tasks):
+            # Bulk inserts don't return instances, so load the plan's events back in one query
+            events_by_task = {
+                event.task_id: event
+                for event in db.query(CalendarEvent).filter(
+                    CalendarEvent.study_plan_id == study_plan_id
+                ).all()
+            }
+        
+        return [events_by_task[task.id] for task in tasks]
+    
+    def _write_calendar_events(
+        self,
+        study_plan_id: int,
+        user_id: int,
+        db: Session,
+        start_date: Optional[datetime] = None,
+        end_date: Optional[datetime] = None,
+        regenerate: bool = False,
+        study_plan: Optional[StudyPlan] = None
+    ) -> Tuple[List[DailyTask], Dict[int, CalendarEvent]]:
+        """
+        Create or update calendar events for the plan's tasks without loading new rows back.
+        
+        Returns:
+            The tasks events were written for, and the updated existing events keyed by task ID
+            (newly inserted events are not included)
+        """
         # Get study plan
-        study_plan = db.query(StudyPlan).filter(
-            StudyPlan.id == study_plan_id,
-            StudyPlan.user_id == user_id
-        ).first()
+        if study_plan is None:
+            study_plan = self._get_plan(db, study_plan_id, user_id)
         
         if not study_plan:
             raise ValueError(f"Study plan {study_plan_id} not found for user {user_id}")
         
+        # Events are about to change, so cached exports of this plan are stale
+        _invalidate_ics_cache(study_plan_id)
+        
         # Delete existing events if regenerating
         if regenerate:
-            existing_events = db.query(CalendarEvent).filter(
+            # Single DELETE statement instead of loading and deleting each event
+            deleted_count = db.query(CalendarEvent).filter(
                 CalendarEvent.study_plan_id == study_plan_id
-            ).all()
-            for event in existing_events:
-                db.delete(event)
-            db.flush()
-            logger.info(f"Deleted {len(existing_events)} existing calendar events for plan {study_plan_id}")
-        
-        # Get all tasks for this plan
-        query = db.query(DailyTask).filter(
+            ).delete(synchronize_session="evaluate")
+            logger.info(f"Deleted {deleted_count} existing calendar events for plan {study_plan_id}")
+        else:
+            # Prefetch existing events once, keyed by task, instead of one query per task
+            existing_by_task = {
+                event.task_id: event
+                for event in db.query(CalendarEvent).filter(
+                    CalendarEvent.study_plan_id == study_plan_id
+                ).all()
+            }
+        
+        # Get all tasks for this plan, loading only the columns events are built from
+        query = db.query(DailyTask).options(
+            load_only(
+                DailyTask.id,
+                DailyTask.task_date,
+                DailyTask.title,
+                DailyTask.description,
+                DailyTask.estimated_minutes,
+                DailyTask.content,
+                DailyTask.skill_names
+            )
+        ).filter(
             DailyTask.study_plan_id == study_plan_id
         )
         
@@ -85,31 +234,59 @@ class CalendarService:
         
         if not tasks:
             logger.warning(f"No tasks found for study plan {study_plan_id}")
-            return []
+            return [], {}
         
         # Generate calendar events
-        events = []
-        for task in tasks:
-            # Skip completed tasks (optional - you might want to include them)
-            # if task.status == TaskStatusEnum.COMPLETED:
-            #     continue
-            
-            event = self._create_event_from_task(task, study_plan_id, db)
-            if event:
-                events.append(event)
+        # One random base per run; the task ID keeps each ICS UID unique
+        uid_base = uuid4().hex
+        events_by_task = {}
+        if regenerate:
+            # All events were just deleted, so skip the existence check entirely
+            new_rows = [
+                self._build_new_event_row(task, study_plan_id, uid_base)
+                for task in tasks
+            ]
+        else:
+            new_rows = []
+            for task in tasks:
+                # Skip completed tasks (optional - you might want to include them)
+                # if task.status == TaskStatusEnum.COMPLETED:
+                #     continue
+                
+                # Check if event already exists
+                existing_event = existing_by_task.get(task.id)
+                
+                if existing_event:
+                    # Existing events are already tracked by the session
+                    self._update_event_from_task(existing_event, task)
+                    events_by_task[task.id] = existing_event
+                else:
+                    new_rows.append(self._build_new_event_row(task, study_plan_id, uid_base))
+        
+        # Insert new events as one multi-row INSERT, without per-object ORM state
+        if new_rows:
+            db.bulk_insert_mappings(CalendarEvent, new_rows)
         
         db.flush()
-        logger.info(f"Generated {len(events)} calendar events for plan {study_plan_id}")
+        logger.info(f"Generated {len(tasks)} calendar events for plan {study_plan_id}")
         
-        return events
+        return tasks, events_by_task
     
-    def _create_event_from_task(
-        self,
-        task: DailyTask,
+    @staticmethod
+    def _get_plan(
+        db: Session,
         study_plan_id: int,
-        db: Session
-    ) -> Optional[CalendarEvent]:
-        """Create a calendar event from a daily task."""
+        user_id: int
+    ) -> Optional[StudyPlan]:
+        """Load a study plan owned by the user."""
+        return db.query(StudyPlan).filter(
+            StudyPlan.id == study_plan_id,
+            StudyPlan.user_id == user_id
+        ).first()
+    
+    @staticmethod
+    def _event_fields_from_task(task: DailyTask) -> Dict[str, Any]:
+        """Compute the calendar event fields derived from a daily task."""
         # Calculate start and end times
         task_date = task.task_date
         if isinstance(task_date, datetime):
@@ -119,30 +296,28 @@ class CalendarService:
             start_time = datetime.combine(task_date, datetime.min.time().replace(hour=9))
         
         # Calculate duration from estimated_minutes or use default
-        duration_minutes = task.estimated_minutes or self.DEFAULT_EVENT_DURATION
+        duration_minutes = task.estimated_minutes or DEFAULT_EVENT_DURATION
         end_time = start_time + timedelta(minutes=duration_minutes)
         
-        # Generate unique ICS UID
-        ics_uid = f"{uuid4()}@irc-coach.local"
-        
         # Build description from task content
         description_parts = [task.description]
         
-        if task.content:
-            if task.content.get("study_materials"):
-                description_parts.append("\n\nStudy Materials:")
-                for material in task.content.get("study_materials", []):
-                    description_parts.append(f"- {material}")
-            
-            if task.content.get("key_concepts"):
-                description_parts.append("\n\nKey Concepts:")
-                for concept in task.content.get("key_concepts", []):
-                    description_parts.append(f"- {concept}")
-            
-            if task.content.get("resources"):
-                description_parts.append("\n\nResources:")
-                for resource in task.content.get("resources", [])[:5]:  # Limit to 5
-                    description_parts.append(f"- {resource}")
+        content = task.content or {}
+        
+        materials = content.get("study_materials") or []
+        if materials:
+            description_parts.append("\n\nStudy Materials:")
+            description_parts.extend(f"- {material}" for material in materials)
+        
+        concepts = content.get("key_concepts") or []
+        if concepts:
+            description_parts.append("\n\nKey Concepts:")
+            description_parts.extend(f"- {concept}" for concept in concepts)
+        
+        resources = content.get("resources") or []
+        if resources:
+            description_parts.append("\n\nResources:")
+            description_parts.extend(f"- {resource}" for resource in resources[:5])  # Limit to 5
         
         description = "\n".join(description_parts)
         
@@ -151,36 +326,39 @@ class CalendarService:
         if task.skill_names:
             location = f"Skills: {', '.join(task.skill_names)}"
         
-        # Check if event already exists
-        existing_event = db.query(CalendarEvent).filter(
-            CalendarEvent.task_id == task.id
-        ).first()
+        return {
+            "title": task.title,
+            "description": description,
+            "start_time": start_time,
+            "end_time": end_time,
+            "location": location,
+        }
+    
+    @staticmethod
+    def _build_new_event_row(
+        task: DailyTask,
+        study_plan_id: int,
+        uid_base: str
+    ) -> Dict[str, Any]:
+        """Build the insert mapping for a new calendar event from a daily task."""
+        # Generate unique ICS UID
+        ics_uid = f"{uid_base}-{task.id}@irc-coach.local"
         
-        if existing_event:
-            # Update existing event
-            existing_event.title = task.title
-            existing_event.description = description
-            existing_event.start_time = start_time
-            existing_event.end_time = end_time
-            existing_event.location = location
-            existing_event.updated_at = datetime.now()
-            return existing_event
-        
-        # Create new event
-        event = CalendarEvent(
+        row = CalendarService._event_fields_from_task(task)
+        row.update(
             study_plan_id=study_plan_id,
             task_id=task.id,
-            title=task.title,
-            description=description,
-            start_time=start_time,
-            end_time=end_time,
-            location=location,
             ics_uid=ics_uid,
             synced=False
         )
-        
-        db.add(event)
-        return event
+        return row
+    
+    @staticmethod
+    def _update_event_from_task(event: CalendarEvent, task: DailyTask) -> None:
+        """Refresh an existing calendar event from its daily task."""
+        for field, value in CalendarService._event_fields_from_task(task).items():
+            setattr(event, field, value)
+        event.updated_at = datetime.utcnow()
     
     def generate_ics_file(
         self,
@@ -188,7 +366,7 @@ class CalendarService:
         user_id: int,
         db: Session,
         calendar_name: Optional[str] = None
-    ) -> str:
+    ) -> bytes:
         """
         Generate ICS (iCalendar) file content from study plan.
         
@@ -199,115 +377,172 @@ class CalendarService:
             calendar_name: Name for the calendar (defaults to "Study Plan")
         
         Returns:
-            ICS file content as string
+            ICS file content as UTF-8 encoded bytes
         """
-        # Get study plan
-        study_plan = db.query(StudyPlan).filter(
+        return b"".join(self.iter_ics_file(study_plan_id, user_id, db, calendar_name))
+    
+    def iter_ics_file(
+        self,
+        study_plan_id: int,
+        user_id: int,
+        db: Session,
+        calendar_name: Optional[str] = None
+    ) -> Iterator[bytes]:
+        """
+        Generate ICS (iCalendar) file content from study plan as a stream of chunks.
+        
+        Database access and validation happen before this returns, so errors
+        (e.g. a missing plan) are raised here rather than while streaming.
+        
+        Args:
+            study_plan_id: Study plan ID
+            user_id: User ID
+            db: Database session
+            calendar_name: Name for the calendar (defaults to "Study Plan")
+        
+        Returns:
+            Iterator of UTF-8 encoded chunks: the header, one per event, and the footer
+        """
+        calendar_name = calendar_name or f"Study Plan - {study_plan_id}"
+        
+        # Fetch the plan and event state in one query to build the cache key.
+        # Every generation run uses a fresh ICS UID base, so max(ics_uid) changes on any
+        # regeneration even when rowids, count and created_at repeat (e.g. on SQLite).
+        plan_state = db.query(
+            StudyPlan.updated_at,
+            func.count(CalendarEvent.id),
+            func.max(CalendarEvent.id),
+            func.max(CalendarEvent.created_at),
+            func.max(CalendarEvent.updated_at),
+            func.max(CalendarEvent.ics_uid)
+        ).outerjoin(
+            CalendarEvent, CalendarEvent.study_plan_id == StudyPlan.id
+        ).filter(
             StudyPlan.id == study_plan_id,
             StudyPlan.user_id == user_id
-        ).first()
+        ).group_by(StudyPlan.id, StudyPlan.updated_at).first()
+        
+        if plan_state is None:
+            raise ValueError(f"Study plan {study_plan_id} not found")
+        
+        cache_key = (study_plan_id, calendar_name, *plan_state)
+        cached_content = _get_cached_ics(cache_key)
+        if cached_content is not None:
+            return iter((cached_content,))
+        
+        # Get study plan together with its calendar events in one query.
+        # populate_existing() refreshes a collection loaded earlier in this session.
+        study_plan = db.query(StudyPlan).options(
+            joinedload(StudyPlan.calendar_events)
+        ).filter(
+            StudyPlan.id == study_plan_id,
+            StudyPlan.user_id == user_id
+        ).populate_existing().first()
         
         if not study_plan:
             raise ValueError(f"Study plan {study_plan_id} not found")
         
         # Ensure calendar events exist
-        events = db.query(CalendarEvent).filter(
-            CalendarEvent.study_plan_id == study_plan_id
-        ).all()
+        events = study_plan.calendar_events
         
+        events_generated = False
         if not events:
             # Generate events if they don't exist
             logger.info(f"No calendar events found, generating from tasks...")
             events = self.generate_calendar_events_from_plan(
-                study_plan_id, user_id, db, regenerate=False
+                study_plan_id, user_id, db, regenerate=False, study_plan=study_plan
             )
+            events_generated = True
         
-        # Generate ICS content
-        calendar_name = calendar_name or f"Study Plan - {study_plan_id}"
-        ics_lines = [
-            "BEGIN:VCALENDAR",
-            "VERSION:2.0",
-            "PRODID:-//Interview Readiness Coach//Study Plan//EN",
-            f"X-WR-CALNAME:{calendar_name}",
-            "CALSCALE:GREGORIAN",
-            "METHOD:PUBLISH"
-        ]
-        
-        # Add timezone (UTC)
-        ics_lines.extend([
-            "BEGIN:VTIMEZONE",
-            "TZID:UTC",
-            "BEGIN:STANDARD",
-            "DTSTART:19700101T000000Z",
-            "TZOFFSETFROM:+0000",
-            "TZOFFSETTO:+0000",
-            "TZNAME:UTC",
-            "END:STANDARD",
-            "END:VTIMEZONE"
-        ])
-        
-        # Add events
+        if not events:
+            # Nothing to export; skip building the calendar line by line
+            return iter((_EMPTY_ICS_TEMPLATE.format(name=calendar_name).encode("utf-8"),))
+        
+        # Chunks are produced after the endpoint returns, outside its try/except and without
+        # the request's DB work, so everything _event_to_ics reads must be loaded now.
+        # This guards against attributes a future change leaves deferred or expired.
         for event in events:
-            event_lines = self._event_to_ics(event)
-            ics_lines.extend(event_lines)
+            unloaded = inspect(event).unloaded & _ICS_EVENT_ATTRIBUTES
+            if unloaded:
+                db.refresh(event, attribute_names=list(unloaded))
         
-        ics_lines.append("END:VCALENDAR")
+        # The cache key describes the state before generation, so only cache existing events
+        return self._iter_ics_chunks(
+            events, calendar_name, None if events_generated else cache_key
+        )
+    
+    def _iter_ics_chunks(
+        self,
+        events: List[CalendarEvent],
+        calendar_name: str,
+        cache_key: Optional[Tuple[Any, ...]]
+    ) -> Iterator[bytes]:
+        """
+        Yield ICS content chunk by chunk.
         
-        return "\r\n".join(ics_lines)
+        Chunks are only retained for caching while the document stays within
+        _ICS_CACHE_MAX_ENTRY_BYTES, so memory held while streaming stays bounded.
+        """
+        retained = [] if cache_key is not None else None
+        retained_bytes = 0
+        
+        def emit(chunk: bytes) -> bytes:
+            nonlocal retained, retained_bytes
+            if retained is not None:
+                retained_bytes += len(chunk)
+                if retained_bytes > _ICS_CACHE_MAX_ENTRY_BYTES:
+                    # Too large to cache; stop holding on to chunks
+                    retained = None
+                else:
+                    retained.append(chunk)
+            return chunk
+        
+        # Generate ICS content
+        yield emit(_ICS_HEADER_TEMPLATE.format(name=calendar_name).encode("utf-8"))
+        
+        # Add events (DTSTAMP is the creation time of this file, shared by all events)
+        dtstamp = _format_ics_datetime(datetime.utcnow())
+        buf = io.StringIO()
+        for event in events:
+            self._event_to_ics(event, buf, dtstamp)
+            chunk = buf.getvalue().encode("utf-8")
+            buf.seek(0)
+            buf.truncate()
+            yield emit(chunk)
+        
+        yield emit(_ICS_FOOTER.encode("utf-8"))
+        
+        # This store can land after a regeneration (and its cache invalidation) committed while
+        # the response was streaming. That is safe: cache_key carries max(ics_uid) from before
+        # the regeneration, so it can never match the regenerated plan's key.
+        if retained is not None:
+            _store_cached_ics(cache_key, b"".join(retained))
     
-    def _event_to_ics(self, event: CalendarEvent) -> List[str]:
-        """Convert a CalendarEvent to ICS format."""
-        # Format datetime to ICS format (UTC)
-        def format_datetime(dt: datetime) -> str:
-            if dt.tzinfo is None:
-                # Assume UTC if no timezone
-                dt = dt.replace(tzinfo=None)
-            return dt.strftime("%Y%m%dT%H%M%SZ")
-        
-        def escape_text(text: str) -> str:
-            """Escape text for ICS format."""
-            if not text:
-                return ""
-            # Replace special characters
-            text = text.replace("\\", "\\\\")
-            text = text.replace(",", "\\,")
-            text = text.replace(";", "\\;")
-            text = text.replace("\n", "\\n")
-            return text
-        
-        lines = [
-            "BEGIN:VEVENT",
-            f"UID:{event.ics_uid or uuid4()}@irc-coach.local",
-            f"DTSTART:{format_datetime(event.start_time)}",
-            f"DTEND:{format_datetime(event.end_time)}",
-            f"SUMMARY:{escape_text(event.title)}",
-            f"DTSTAMP:{format_datetime(datetime.now())}",
-            f"CREATED:{format_datetime(event.created_at)}"
-        ]
+    @staticmethod
+    def _event_to_ics(event: CalendarEvent, buf: io.StringIO, dtstamp: str) -> None:
+        """Write a CalendarEvent to the ICS buffer."""
+        buf.write(_VEVENT_TEMPLATE.format(
+            uid=event.ics_uid,
+            dtstart=_format_ics_datetime(event.start_time),
+            dtend=_format_ics_datetime(event.end_time),
+            summary=_escape_ics_text(event.title),
+            dtstamp=dtstamp,
+            created=_format_ics_datetime(event.created_at)
+        ))
         
         if event.description:
             # ICS has 75 character line limit, so we need to fold long lines
-            desc = escape_text(event.description)
-            if len(desc) > 75:
-                # Fold the description
-                folded_desc = ""
-                for i in range(0, len(desc), 75):
-                    if i > 0:
-                        folded_desc += "\r\n "
-                    folded_desc += desc[i:i+75]
-                lines.append(f"DESCRIPTION:{folded_desc}")
-            else:
-                lines.append(f"DESCRIPTION:{desc}")
+            desc = _escape_ics_text(event.description)
+            folded_desc = "\r\n ".join(desc[i:i+75] for i in range(0, len(desc), 75))
+            buf.write(f"DESCRIPTION:{folded_desc}\r\n")
         
         if event.location:
-            lines.append(f"LOCATION:{escape_text(event.location)}")
+            buf.write(f"LOCATION:{_escape_ics_text(event.location)}\r\n")
         
         if event.task_id:
-            lines.append(f"URL:http://irc-coach.local/tasks/{event.task_id}")
-        
-        lines.append("END:VEVENT")
+            buf.write(f"URL:http://irc-coach.local/tasks/{event.task_id}\r\n")
         
-        return lines
+        buf.write("END:VEVENT\r\n")
     
     def regenerate_calendar(
         self,
@@ -322,13 +557,14 @@ class CalendarService:
         Returns:
             Summary of regeneration
         """
-        events = self.generate_calendar_events_from_plan(
+        # Only the count is reported, so the inserted events are not loaded back
+        tasks, _ = self._write_calendar_events(
             study_plan_id, user_id, db, regenerate=True
         )
         
         return {
             "study_plan_id": study_plan_id,
-            "events_generated": len(events),
-            "regenerated_at": datetime.now().isoformat()
+            "events_generated": len(tasks),
+            "regenerated_at": datetime.utcnow().isoformat()
         }
 
@@ -0,0 +1,35 @@
+"""
+Migration script to add the idx_calendar_event_plan_task index to calendar_events table.
+
+Base.metadata.create_all skips tables that already exist (including their indexes),
+so existing databases need this one-off migration.
+"""
+import sys
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from sqlalchemy import text
+from app.db.database import engine
+
+def migrate():
+    """Add idx_calendar_event_plan_task index if it doesn't exist."""
+    print("Migrating database: Adding idx_calendar_event_plan_task index to calendar_events...")
+
+    try:
+        with engine.connect() as conn:
+            conn.execute(text(
+                "CREATE INDEX IF NOT EXISTS idx_calendar_event_plan_task "
+                "ON calendar_events (study_plan_id, task_id)"
+            ))
+            conn.commit()
+            print("✓ Migration completed successfully!")
+
+    except Exception as e:
+        print(f"✗ Migration failed: {e}")
+        raise
+
+if __name__ == "__main__":
+    migrate()
@@ -0,0 +1,233 @@
+"""
+Calendar Service Tests - Phase 11
+Validates the in-process ICS export cache.
+"""
+import pytest
+from datetime import datetime, timedelta
+from sqlalchemy.orm import Session
+
+from app.db.database import SessionLocal, engine
+from app.db.models import Base, User, StudyPlan, DailyTask, CalendarEvent, TaskTypeEnum
+from app.services import calendar_service
+from app.services.calendar_service import CalendarService
+
+
+@pytest.fixture(scope="function")
+def db_session():
+    """Create a test database session."""
+    Base.metadata.create_all(bind=engine)
+    session = SessionLocal()
+    try:
+        yield session
+    finally:
+        session.close()
+        Base.metadata.drop_all(bind=engine)
+
+
+@pytest.fixture(autouse=True)
+def clear_ics_cache():
+    """Start and end every test with an empty ICS cache."""
+    calendar_service._ICS_CACHE.clear()
+    yield
+    calendar_service._ICS_CACHE.clear()
+
+
+@pytest.fixture
+def test_user(db_session: Session):
+    """Create a test user."""
+    user = User(email="calendar@example.com", name="Calendar User")
+    db_session.add(user)
+    db_session.commit()
+    db_session.refresh(user)
+    return user
+
+
+@pytest.fixture
+def study_plan(db_session: Session, test_user):
+    """Create a study plan with a few tasks and no calendar events."""
+    plan = StudyPlan(user_id=test_user.id, weeks=1, hours_per_week=10.0, plan_data={})
+    db_session.add(plan)
+    db_session.flush()
+
+    start = datetime(2026, 1, 5, 9, 0)
+    for day in range(3):
+        db_session.add(DailyTask(
+            study_plan_id=plan.id,
+            task_date=start + timedelta(days=day),
+            task_type=TaskTypeEnum.LEARN,
+            title=f"Task {day}",
+            description=f"Study session {day}",
+            skill_names=["Python"],
+            estimated_minutes=45,
+            content={"key_concepts": ["Decorators", "Generators"]}
+        ))
+    db_session.commit()
+    db_session.refresh(plan)
+    return plan
+
+
+class TestICSCache:
+    """Test caching of generated ICS content."""
+
+    def test_cache_hit_returns_identical_bytes(self, db_session: Session, test_user, study_plan, monkeypatch):
+        """A repeated export is served from the cache without rebuilding."""
+        service = CalendarService()
+        service.generate_calendar_events_from_plan(study_plan.id, test_user.id, db_session)
+        db_session.commit()
+
+        first = service.generate_ics_file(study_plan.id, test_user.id, db_session)
+        assert len(calendar_service._ICS_CACHE) == 1
+
+        def fail_rebuild(*args, **kwargs):
+            raise AssertionError("ICS content was rebuilt on a cache hit")
+
+        monkeypatch.setattr(CalendarService, "_iter_ics_chunks", fail_rebuild)
+        second = service.generate_ics_file(study_plan.id, test_user.id, db_session)
+
+        assert second == first
+
+    @pytest.mark.parametrize("regenerate", [False, True])
+    def test_cache_invalidated_after_generating_events(self, db_session: Session, test_user, study_plan, regenerate):
+        """Updating or regenerating events drops the plan's cached exports."""
+        service = CalendarService()
+        service.generate_calendar_events_from_plan(study_plan.id, test_user.id, db_session)
+        db_session.commit()
+
+        first = service.generate_ics_file(study_plan.id, test_user.id, db_session)
+        assert len(calendar_service._ICS_CACHE) == 1
+
+        task = db_session.query(DailyTask).filter(
+            DailyTask.study_plan_id == study_plan.id
+        ).order_by(DailyTask.task_date).first()
+        task.title = "Renamed task"
+        db_session.commit()
+
+        service.generate_calendar_events_from_plan(
+            study_plan.id, test_user.id, db_session, regenerate=regenerate
+        )
+        db_session.commit()
+        assert not calendar_service._ICS_CACHE
+
+        second = service.generate_ics_file(study_plan.id, test_user.id, db_session)
+        assert b"SUMMARY:Renamed task" not in first
+        assert b"SUMMARY:Renamed task" in second
+
+    def test_regeneration_within_same_second_misses(self, db_session: Session, test_user, study_plan):
+        """A regeneration changes the key even when ids, count and timestamps repeat."""
+        service = CalendarService()
+        service.generate_calendar_events_from_plan(study_plan.id, test_user.id, db_session)
+        db_session.commit()
+
+        first = service.generate_ics_file(study_plan.id, test_user.id, db_session)
+        created_at = db_session.query(CalendarEvent.created_at).filter(
+            CalendarEvent.study_plan_id == study_plan.id
+        ).first()[0]
+
+        task = db_session.query(DailyTask).filter(
+            DailyTask.study_plan_id == study_plan.id
+        ).order_by(DailyTask.task_date).first()
+        task.title = "Renamed task"
+        db_session.commit()
+
+        # Simulate a regeneration by another worker: its invalidation doesn't reach this cache
+        cached_entries = dict(calendar_service._ICS_CACHE)
+        service.regenerate_calendar(study_plan.id, test_user.id, db_session)
+        calendar_service._ICS_CACHE.update(cached_entries)
+        # Pin the timestamps as if the regeneration happened within the same second
+        db_session.query(CalendarEvent).filter(
+            CalendarEvent.study_plan_id == study_plan.id
+        ).update(
+            {CalendarEvent.created_at: created_at, CalendarEvent.updated_at: None},
+            synchronize_session=False
+        )
+        db_session.commit()
+
+        second = service.generate_ics_file(study_plan.id, test_user.id, db_session)
+
+        assert second != first
+        assert b"SUMMARY:Renamed task" in second
+
+    def test_calendar_name_change_misses(self, db_session: Session, test_user, study_plan):
+        """The calendar name is part of the cache key."""
+        service = CalendarService()
+        service.generate_calendar_events_from_plan(study_plan.id, test_user.id, db_session)
+        db_session.commit()
+
+        first = service.generate_ics_file(study_plan.id, test_user.id, db_session, "Calendar A")
+        second = service.generate_ics_file(study_plan.id, test_user.id, db_session, "Calendar B")
+
+        assert b"X-WR-CALNAME:Calendar A\r\n" in first
+        assert b"X-WR-CALNAME:Calendar B\r\n" in second
+        assert len(calendar_service._ICS_CACHE) == 2
+
+    def test_generate_if_empty_path_not_cached(self, db_session: Session, test_user, study_plan):
+        """Content built right after generating missing events is not stored."""
+        service = CalendarService()
+
+        ics = service.generate_ics_file(study_plan.id, test_user.id, db_session)
+
+        assert ics.count(b"BEGIN:VEVENT") == 3
+        assert not calendar_service._ICS_CACHE
+
+
+class TestICSStreaming:
+    """Test streamed ICS exports."""
+
+    def test_large_export_streamed_without_caching(self, db_session: Session, test_user, study_plan, monkeypatch):
+        """Documents above the cache entry limit are streamed but not retained."""
+        service = CalendarService()
+        service.generate_calendar_events_from_plan(study_plan.id, test_user.id, db_session)
+        db_session.commit()
+        monkeypatch.setattr(calendar_service, "_ICS_CACHE_MAX_ENTRY_BYTES", 100)
+
+        chunks = list(service.iter_ics_file(study_plan.id, test_user.id, db_session))
+
+        assert len(chunks) == 5  # header, one per event, footer
+        assert b"".join(chunks).endswith(b"END:VCALENDAR")
+        assert not calendar_service._ICS_CACHE
+
+    def test_stream_needs_no_session_access(self, db_session: Session, test_user, study_plan, monkeypatch):
+        """Unloaded event attributes are loaded before the stream is returned."""
+        service = CalendarService()
+        generate_events = CalendarService.generate_calendar_events_from_plan
+
+        def generate_expired_events(self, *args, **kwargs):
+            events = generate_events(self, *args, **kwargs)
+            for event in events:
+                db_session.expire(event)
+            return events
+
+        monkeypatch.setattr(
+            CalendarService, "generate_calendar_events_from_plan", generate_expired_events
+        )
+
+        chunks = service.iter_ics_file(study_plan.id, test_user.id, db_session)
+        # Consuming the stream must not touch the session
+        db_session.expunge_all()
+
+        ics = b"".join(chunks)
+        assert ics.count(b"BEGIN:VEVENT") == 3
+        assert b"SUMMARY:Task 0\r\n" in ics
+
+    def test_stream_consumed_after_regeneration_does_not_cache_stale_bytes(self, db_session: Session, test_user, study_plan):
+        """A stream finishing after a regeneration can't poison the regenerated plan's cache."""
+        service = CalendarService()
+        service.generate_calendar_events_from_plan(study_plan.id, test_user.id, db_session)
+        db_session.commit()
+
+        chunks = service.iter_ics_file(study_plan.id, test_user.id, db_session)
+
+        task = db_session.query(DailyTask).filter(
+            DailyTask.study_plan_id == study_plan.id
+        ).order_by(DailyTask.task_date).first()
+        task.title = "Renamed task"
+        db_session.commit()
+        service.regenerate_calendar(study_plan.id, test_user.id, db_session)
+        db_session.commit()
+
+        stale = b"".join(chunks)
+        assert b"SUMMARY:Renamed task" not in stale
+
+        current = service.generate_ics_file(study_plan.id, test_user.id, db_session)
+        assert b"SUMMARY:Renamed task" in current
+        assert current != stale